@@ -1,15 +1,17 @@
 from __future__ import annotations
 
 import sys
-from contextlib import suppress
-from csv import reader
-from enum import Enum
+from bisect import bisect_right
 from enum import IntEnum
+from functools import cache
 from functools import cached_property
-from io import StringIO
-from itertools import chain
+from functools import lru_cache
+from math import ceil
+from math import floor
+from operator import attrgetter
 from pathlib import Path
 from typing import TYPE_CHECKING
+from typing import ClassVar
 from typing import Literal
 from typing import Self
 from typing import TypedDict
@@ -27,7 +29,7 @@ import pygame.time
 from defusedxml.ElementTree import parse as xml_parse
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
+    from collections.abc import Callable
     from collections.abc import Iterator
     from collections.abc import Sequence
     from xml.etree.ElementTree import Element
@@ -60,31 +62,31 @@ MOVEMENT_SPEED_WALKING = 60
 MOVEMENT_SPEED_RUNNING = 180
 ANIMATION_SPEED = 5
 
+_MOVEMENT_SPEEDS = (0, MOVEMENT_SPEED_WALKING, MOVEMENT_SPEED_RUNNING)  # indexed by MovementStatus
+
+_draw_order = attrgetter("layer", "y_sort")
+
 
 class Assets(TypedDict):
     map_1: TiledMap
     map_2: TiledMap
-    player_sprites: dict[tuple[MovementDirection, MovementStatus], list[pygame.surface.Surface]]
+    player_sprites: list[list[list[pygame.surface.Surface]]]  # indexed by [MovementDirection][MovementStatus]
 
 
-class MovementDirection(Enum):
-    DOWN = "down"
-    UP = "up"
-    RIGHT = "right"
-    LEFT = "left"
+class MovementDirection(IntEnum):  # ordered as the player sprite sheet rows
+    DOWN = 0
+    UP = 1
+    LEFT = 2
+    RIGHT = 3
 
 
-class MovementStatus(Enum):
-    IDLE = "idle"
-    WALKING = "walking"
-    RUNNING = "running"
+class MovementStatus(IntEnum):
+    IDLE = 0
+    WALKING = 1
+    RUNNING = 2
 
     def get_movement_speed(self: Self) -> int:
-        if self == MovementStatus.RUNNING:
-            return MOVEMENT_SPEED_RUNNING
-        if self == MovementStatus.WALKING:
-            return MOVEMENT_SPEED_WALKING
-        return 0
+        return _MOVEMENT_SPEEDS[self]
 
 
 class SpriteLayer(IntEnum):
@@ -105,6 +107,9 @@ class Game:
     def __init__(self: Self) -> None:
         pygame.display.set_caption("The Game")
         self.surface = pygame.display.set_mode(WINDOW_SIZE)
+        # only quit and key-down (Escape/Q) events are handled, movement polls the keyboard state instead
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed([pygame.constants.QUIT, pygame.constants.KEYDOWN])
         self.clock = pygame.time.Clock()
         self.camera = Camera()
         self.collision_group = CollisionGroup()
@@ -130,13 +135,7 @@ class Game:
         self.collision_group.clear()
         self.entities.clear()
         tiled_map = self._assets[name]
-        for x, y, surface in tiled_map.get_layer("background").tiles():
-            tile = Tile(
-                position=(x, y),
-                surface=surface,
-                layer=SpriteLayer.BACKGROUND,
-            )
-            self.camera.append(tile)
+        self.camera.set_background(tiled_map.get_layer("background").render())
         for obj in tiled_map.get_object_group("walls"):
             self.collision_group.append(obj.rect)
         for obj in tiled_map.get_object_group("warps"):
@@ -146,7 +145,7 @@ class Game:
         obj = tiled_map.get_object_group(object_group).get_object(object_name)
         self.player = Player(
             position=obj.position,
-            surface=self._assets["player_sprites"][(MovementDirection.DOWN, MovementStatus.IDLE)][0],
+            surface=self._assets["player_sprites"][MovementDirection.DOWN][MovementStatus.IDLE][0],
             layer=SpriteLayer.MAIN,
             collision_group=self.collision_group,
             animations=self._assets["player_sprites"],
@@ -171,27 +170,19 @@ class Game:
             dt = self.clock.tick(FPS) / 1000
 
     def handle_event(self: Self, event: pygame.event.Event) -> None:
-        if event.type == pygame.constants.QUIT:
+        if event.type == pygame.constants.QUIT or (
+            event.type == pygame.constants.KEYDOWN
+            and event.key in (pygame.constants.K_ESCAPE, pygame.constants.K_q)  # pyright: ignore[reportAny]
+        ):
             pygame.quit()
             sys.exit(0)
-        if event.type == pygame.constants.KEYDOWN:
-            if event.key == pygame.constants.K_ESCAPE:  # pyright: ignore[reportAny]
-                pygame.quit()
-                sys.exit(0)
-            if event.key == pygame.constants.K_q:  # pyright: ignore[reportAny]
-                pygame.quit()
-                sys.exit(0)
 
     def draw(self: Self) -> None:
         self.camera.box_target(self.player)
         self.camera.draw()
-        _ = self.surface.fill(BLACK)
-        _ = pygame.transform.scale_by(
-            self.camera.surface,
-            factor=_SCALE_FACTOR,
-            dest_surface=self.surface,
-        )
-        pygame.display.update()
+        # the camera surface is exactly WINDOW_SIZE / _SCALE_FACTOR, scaling covers the whole window
+        _ = pygame.transform.scale(self.camera.surface, WINDOW_SIZE, self.surface)
+        pygame.display.flip()
 
 
 class Camera:
@@ -199,11 +190,13 @@ class Camera:
     surface: pygame.surface.Surface
     rect: pygame.rect.FRect
     offset: pygame.math.Vector2
+    background: pygame.surface.Surface | None = None
+    _background_rect: pygame.rect.FRect | None = None
     _area_rect: pygame.rect.FRect | None = None
 
     def __init__(self: Self, size: Point = VIEWPORT_SIZE) -> None:
         self.items = []
-        self.surface = pygame.surface.Surface(size)
+        self.surface = pygame.surface.Surface(size).convert()
         self.rect = self.surface.get_frect()
         self.offset = pygame.math.Vector2()
 
@@ -221,44 +214,102 @@ class Camera:
 
     def clear(self: Self) -> None:
         self.items.clear()
+        self.background = None
+        self._background_rect = None
+        self._area_rect = None
+
+    def set_background(self: Self, surface: pygame.surface.Surface) -> None:
+        """Set a pre-rendered surface drawn below every item, anchored at the world origin"""
+        self.background = surface
+        self._background_rect = surface.get_frect()
         self._area_rect = None
 
-    @cached_property
     def min_area_rect(self: Self) -> pygame.rect.FRect:
         if self._area_rect is None:
-            self._area_rect = get_min_area([tile.rect for tile in self.items])
+            rects = [tile.rect for tile in self.items]
+            if self._background_rect is not None:
+                rects.append(self._background_rect)
+            self._area_rect = get_min_area(rects)
         return self._area_rect
 
     def box_target(self: Self, entity: Entity) -> None:
         self.rect.center = entity.rect.center
-        self.rect.clamp_ip(self.min_area_rect)
+        self.rect.clamp_ip(self.min_area_rect())
         self.offset.update(self.rect.topleft)
 
     def draw(self: Self) -> None:
-        _ = self.surface.fill(BLACK)
-        items = self.items
-        items = sorted(items, key=lambda item: (item.layer, item.y_sort))
-        _ = self.surface.blits((item.surface, item.rect.move(-self.offset)) for item in items)
-        draw_grid(self.surface, offset=-self.offset)
+        # the background is opaque, clearing is only needed where it does not reach
+        if self._background_rect is None or not self._background_rect.contains(self.rect):
+            _ = self.surface.fill(BLACK)
+        if self.background is not None:
+            _ = self.surface.blit(self.background, (0, 0), area=self.rect)
+        ox, oy = self.offset
+        # only the items overlapping the viewport, in draw order
+        visible = sorted((i for i in self.items if self.rect.colliderect(i.rect)), key=_draw_order)
+        self.surface.fblits([(item.surface, (item.rect.x - ox, item.rect.y - oy)) for item in visible])
+        draw_grid(self.surface, offset=(-ox, -oy))
 
 
 class CollisionGroup:
     items: list[pygame.rect.FRect]
+    _buckets: dict[tuple[int, int], list[int]]
+    _bucket_size: int
+    _stamps: list[int]  # per item, the last query that returned it
+    _query_id: int = 0
 
-    def __init__(self: Self) -> None:
+    def __init__(self: Self, bucket_size: int = _TILE_SIZE) -> None:
         self.items = []
+        self._buckets = {}
+        self._bucket_size = bucket_size
+        self._stamps = []
 
     def append(self: Self, item: pygame.rect.FRect) -> None:
         self.items.append(item)
+        self._stamps.append(0)
+        self._add_to_buckets(len(self.items) - 1, item)
 
     def extend(self: Self, item: list[pygame.rect.FRect]) -> None:
+        start = len(self.items)
         self.items.extend(item)
+        self._stamps.extend([0] * len(item))
+        for index, rect in enumerate(item, start=start):
+            self._add_to_buckets(index, rect)
 
     def remove(self: Self, item: pygame.rect.FRect) -> None:
         self.items.remove(item)
+        _ = self._stamps.pop()
+        # indexes after the removed item shifted, rebuild the buckets
+        self._buckets.clear()
+        for index, rect in enumerate(self.items):
+            self._add_to_buckets(index, rect)
 
     def clear(self: Self) -> None:
         self.items.clear()
+        self._stamps.clear()
+        self._buckets.clear()
+
+    def query(self: Self, rect: pygame.rect.FRect) -> list[pygame.rect.FRect]:
+        """Return the items sharing a bucket with rect, each one once"""
+        # stamp items with the query id instead of collecting the indexes into a set
+        self._query_id += 1
+        query_id, stamps, items, buckets = self._query_id, self._stamps, self.items, self._buckets
+        found: list[pygame.rect.FRect] = []
+        for key in self._get_bucket_keys(rect):
+            for index in buckets.get(key, ()):
+                if stamps[index] != query_id:
+                    stamps[index] = query_id
+                    found.append(items[index])
+        return found
+
+    def _add_to_buckets(self: Self, index: int, rect: pygame.rect.FRect) -> None:
+        for key in self._get_bucket_keys(rect):
+            self._buckets.setdefault(key, []).append(index)
+
+    def _get_bucket_keys(self: Self, rect: pygame.rect.FRect) -> Iterator[tuple[int, int]]:
+        size = self._bucket_size
+        for y in range(floor(rect.top / size), ceil(rect.bottom / size)):
+            for x in range(floor(rect.left / size), ceil(rect.right / size)):
+                yield (x, y)
 
 
 class Tile:
@@ -273,8 +324,7 @@ class Tile:
         layer: SpriteLayer = SpriteLayer.BACKGROUND,
     ) -> None:
         if surface is None:
-            surface = pygame.surface.Surface(TILE_SIZE)
-            _ = surface.fill(MAGENTA)
+            surface = _get_placeholder_surface()
         self.surface = surface
         self.rect = surface.get_frect(topleft=position)
         self.layer = layer
@@ -290,73 +340,79 @@ class Tile:
 class Entity(Tile):
     surface: pygame.surface.Surface
     hitbox: pygame.rect.FRect
-    movement_vector: pygame.math.Vector2
+    movement_vector: Point
     movement_direction: MovementDirection
     movement_status: MovementStatus
     moving: bool = False
     collision_group: CollisionGroup | None
-    animations: dict[tuple[MovementDirection, MovementStatus], list[pygame.surface.Surface]]
+    animations: list[list[list[pygame.surface.Surface]]]
     _animation_index: float = 0  # XXX: animation interruption
+    _current_frames: list[pygame.surface.Surface] | None = None
 
     def __init__(
         self: Self,
         position: Point = (0, 0),
         surface: pygame.surface.Surface | None = None,
-        movement_vector: pygame.math.Vector2 | None = None,
+        movement_vector: Point = (0, 0),
         movement_direction: MovementDirection = MovementDirection.DOWN,
         movement_status: MovementStatus = MovementStatus.IDLE,
         layer: SpriteLayer = SpriteLayer.MAIN,
         collision_group: CollisionGroup | None = None,
-        animations: dict[tuple[MovementDirection, MovementStatus], list[pygame.surface.Surface]]
-        | None = None,
+        animations: list[list[list[pygame.surface.Surface]]] | None = None,
     ) -> None:
         super().__init__(position=position, surface=surface, layer=layer)
-        if movement_vector is None:
-            movement_vector = pygame.math.Vector2(0, 0)
         if animations is None:
-            animations = {}
+            animations = []
         self.movement_vector = movement_vector
         self.movement_direction = movement_direction
         self.movement_status = movement_status
         self.collision_group = collision_group
         self.animations = animations
+        self._update_current_frames()
         # XXX: better handle hitbox shape/size/anchor
         self.hitbox = pygame.rect.FRect(position, (_TILE_SIZE, _TILE_SIZE))
         self.rect.bottomleft = self.hitbox.bottomleft
 
     def move_down(self: Self, run: bool = False) -> None:  # noqa: FBT001, FBT002
-        self._move(MovementDirection.DOWN, pygame.math.Vector2(0, _TILE_SIZE), run)
+        self._move(MovementDirection.DOWN, (0, _TILE_SIZE), run)
 
     def move_up(self: Self, run: bool = False) -> None:  # noqa: FBT001, FBT002
-        self._move(MovementDirection.UP, pygame.math.Vector2(0, -_TILE_SIZE), run)
+        self._move(MovementDirection.UP, (0, -_TILE_SIZE), run)
 
     def move_right(self: Self, run: bool = False) -> None:  # noqa: FBT001, FBT002
-        self._move(MovementDirection.RIGHT, pygame.math.Vector2(_TILE_SIZE, 0), run)
+        self._move(MovementDirection.RIGHT, (_TILE_SIZE, 0), run)
 
     def move_left(self: Self, run: bool = False) -> None:  # noqa: FBT001, FBT002
-        self._move(MovementDirection.LEFT, pygame.math.Vector2(-_TILE_SIZE, 0), run)
+        self._move(MovementDirection.LEFT, (-_TILE_SIZE, 0), run)
 
     def _move(
         self: Self,
         direction: MovementDirection,
-        vector: pygame.math.Vector2,
+        vector: Point,
         run: bool = False,  # noqa: FBT001, FBT002
     ) -> None:
         # XXX: implement throttle here; if running, bypass throttle
         if self.movement_direction != direction:
             self.movement_direction = direction
+            self._update_current_frames()
+            return
+        target = self.hitbox.move(vector)
+        # moves are axis aligned between adjacent tiles, testing the swept area once covers every frame
+        if self.collision_test(self.hitbox.union(target)):
             return
-        self.movement_vector = self.hitbox.topleft + vector
+        self.movement_vector = target.topleft
         if run:
             self.movement_status = MovementStatus.RUNNING
         else:
             self.movement_status = MovementStatus.WALKING
+        self._update_current_frames()
         self.moving = True
 
     def move_stop(self: Self) -> None:
         self.moving = False
-        self.movement_vector = pygame.math.Vector2()
+        self.movement_vector = (0, 0)
         self.movement_status = MovementStatus.IDLE
+        self._update_current_frames()
 
     @override
     def update(self: Self, dt: float) -> None:
@@ -364,68 +420,71 @@ class Entity(Tile):
         self.update_position(dt)
 
     def set_animation_frame(self: Self, dt: float) -> None:
-        with suppress(KeyError):
-            frames = self.animations[(self.movement_direction, self.movement_status)]
-            self._animation_index = (self._animation_index + ANIMATION_SPEED * dt) % len(frames)
-            self.surface = frames[int(self._animation_index)]
+        frames = self._current_frames
+        if frames is None:
+            return
+        self._animation_index = (self._animation_index + ANIMATION_SPEED * dt) % len(frames)
+        self.surface = frames[int(self._animation_index)]
+
+    def _update_current_frames(self: Self) -> None:
+        # only called on direction/status transitions, the per frame update reuses the cached list
+        if not self.animations:
+            return
+        self._current_frames = self.animations[self.movement_direction][self.movement_status]
 
     def update_position(self: Self, dt: float) -> None:
-        if self.movement_vector.magnitude() == 0:
+        if not self.moving:
             return
-        movement_speed = round(self.movement_status.get_movement_speed() * dt)
-        pos = pygame.math.Vector2(self.hitbox.topleft)
-        pos.move_towards_ip(self.movement_vector, movement_speed)
-        if pos == self.movement_vector:
-            self.move_stop()
-        rect = self.hitbox.copy()
-        rect.topleft = pos
-        if self.collision_test(rect):
+        step = _MOVEMENT_SPEEDS[self.movement_status] * dt
+        x, y = self.hitbox.topleft
+        target_x, target_y = self.movement_vector
+        dx, dy = target_x - x, target_y - y
+        # moves are axis aligned, so the manhattan distance is the euclidean one
+        distance = abs(dx) + abs(dy)
+        if distance <= step:
+            x, y = target_x, target_y
             self.move_stop()
-            return
-        self.hitbox.topleft = rect.topleft
+        else:
+            ratio = step / distance
+            x, y = x + dx * ratio, y + dy * ratio
+        self.hitbox.topleft = (x, y)
         self.rect.bottomleft = self.hitbox.bottomleft
 
     def collision_test(self: Self, rect: pygame.rect.FRect) -> bool:
         if not self.collision_group:
             return False
-        for item in self.collision_group.items:
-            if not item.colliderect(rect):
-                continue
-            if self.movement_direction == MovementDirection.DOWN:
-                rect.bottom = item.top
-            elif self.movement_direction == MovementDirection.UP:
-                rect.top = item.bottom
-            elif self.movement_direction == MovementDirection.RIGHT:
-                rect.right = item.left
-            elif self.movement_direction == MovementDirection.LEFT:
-                rect.left = item.right
-            return True
-        return False
+        return rect.collidelist(self.collision_group.query(rect)) != -1
 
 
 @final
 class Player(Entity):
+    # indexed by the pressed directions bitmask, keeps the down > up > right > left priority
+    _moves_by_input: ClassVar[tuple[Callable[[Entity, bool], None] | None, ...]] = tuple(
+        Entity.move_down
+        if code & 0b0001
+        else Entity.move_up
+        if code & 0b0010
+        else Entity.move_right
+        if code & 0b0100
+        else Entity.move_left
+        if code & 0b1000
+        else None
+        for code in range(16)
+    )
+
     def get_input(self: Self) -> None:
         if self.moving:
             return
         keys = pygame.key.get_pressed()
-        keys_down = keys[pygame.constants.K_DOWN] or keys[pygame.constants.K_s]
-        keys_up = keys[pygame.constants.K_UP] or keys[pygame.constants.K_w]
-        keys_right = keys[pygame.constants.K_RIGHT] or keys[pygame.constants.K_d]
-        keys_left = keys[pygame.constants.K_LEFT] or keys[pygame.constants.K_a]
-        keys_run = keys[pygame.constants.K_LSHIFT] or keys[pygame.constants.K_RSHIFT]
-        if keys_down:
-            self.move_down(run=keys_run)
-            return
-        if keys_up:
-            self.move_up(run=keys_run)
-            return
-        if keys_right:
-            self.move_right(run=keys_run)
-            return
-        if keys_left:
-            self.move_left(run=keys_run)
-            return
+        code = (
+            (keys[pygame.constants.K_DOWN] or keys[pygame.constants.K_s])
+            | (keys[pygame.constants.K_UP] or keys[pygame.constants.K_w]) << 1
+            | (keys[pygame.constants.K_RIGHT] or keys[pygame.constants.K_d]) << 2
+            | (keys[pygame.constants.K_LEFT] or keys[pygame.constants.K_a]) << 3
+        )
+        if move := self._moves_by_input[code]:
+            keys_run = keys[pygame.constants.K_LSHIFT] or keys[pygame.constants.K_RSHIFT]
+            move(self, keys_run)
 
 
 class Warps:
@@ -444,6 +503,7 @@ class TiledMap:
     object_groups_by_id: dict[int, TiledObjectGroup]
     tilesets: list[TiledTileset]
     tilesets_by_name: dict[str, TiledTileset]
+    _firstgids: list[int]
     width: int
     height: int
     tilewidth: int
@@ -466,8 +526,12 @@ class TiledMap:
         self.object_groups = [TiledObjectGroup(el, self) for el in root.findall("objectgroup")]
         self.object_groups_by_name = {t.name: t for t in self.object_groups}
         self.object_groups_by_id = {t.id: t for t in self.object_groups}
-        self.tilesets = [TiledTileset(el, self) for el in root.findall("tileset")]
+        self.tilesets = sorted(
+            (TiledTileset(el, self) for el in root.findall("tileset")),
+            key=attrgetter("firstgid"),
+        )
         self.tilesets_by_name = {t.name: t for t in self.tilesets}
+        self._firstgids = [t.firstgid for t in self.tilesets]
 
     def get_layer(self: Self, key: str | int) -> TiledTileLayer:
         if isinstance(key, str):
@@ -479,21 +543,18 @@ class TiledMap:
             return self.object_groups_by_name[key]
         return self.object_groups_by_id[key]
 
-    def get_tile(self: Self, gid: str) -> pygame.surface.Surface:
-        for tileset in self.tilesets:
-            if int(gid) < tileset.firstgid:
-                continue
-            try:
-                return tileset[gid]
-            except KeyError:
-                break
-        msg = f"Tile GID {gid} not found in any tileset"
-        raise KeyError(msg)
+    def get_tile(self: Self, gid: int) -> pygame.surface.Surface:
+        # the tileset owning a gid is the last one starting at or before it
+        index = bisect_right(self._firstgids, gid) - 1
+        if index < 0:
+            msg = f"Tile GID {gid} not found in any tileset"
+            raise KeyError(msg)
+        return self.tilesets[index][gid]
 
 
 class TiledTileLayer:
     _parent: TiledMap
-    data: list[tuple[str]]
+    data: list[int]  # row major, width * height gids
     name: str
     id: int
     width: int
@@ -509,18 +570,29 @@ class TiledTileLayer:
         self.id = int(node.attrib["id"])
         self.width = int(node.attrib["width"])
         self.height = int(node.attrib["height"])
-        self.data = load_tiles_data(data_node.text, self.width)
+        self.data = load_tiles_data(data_node.text)
+        if len(self.data) != self.width * self.height:
+            msg = f"Layer {self.name} has {len(self.data)} tiles, expected {self.width}x{self.height}"
+            raise ValueError(msg)
 
-    def __iter__(self: Self) -> Iterator[tuple[int, int, str]]:
+    def __iter__(self: Self) -> Iterator[tuple[int, int, int]]:
         tilewidth, tileheight = self._parent.tilewidth, self._parent.tileheight
-        for y, row in enumerate(self.data):
-            for x, gid in enumerate(row):
-                yield (x * tilewidth, y * tileheight, gid)
+        width = self.width
+        for i, gid in enumerate(self.data):
+            y, x = divmod(i, width)
+            yield (x * tilewidth, y * tileheight, gid)
 
     def tiles(self: Self) -> Iterator[tuple[int, int, pygame.surface.Surface]]:
         for x, y, gid in self:
             yield (x, y, self._parent.get_tile(gid))
 
+    def render(self: Self) -> pygame.surface.Surface:
+        size = (self.width * self._parent.tilewidth, self.height * self._parent.tileheight)
+        surface = pygame.surface.Surface(size).convert()
+        _ = surface.fill(BLACK)
+        surface.fblits([(tile, (x, y)) for x, y, tile in self.tiles()])
+        return surface
+
 
 class TiledObjectGroup:
     _parent: TiledMap
@@ -587,7 +659,7 @@ class TiledObject:
 
 class TiledTileset:
     _parent: TiledMap
-    tiles: dict[str, pygame.surface.Surface]
+    tiles: list[pygame.surface.Surface]
     firstgid: int
     source: Path
     name: str
@@ -598,6 +670,7 @@ class TiledTileset:
     image_width: int
     image_height: int
     image_source: Path
+    image_trans: pygame.color.Color | None
 
     def __init__(self: Self, node: Element, parent: TiledMap) -> None:
         source = parent.filename.parent / node.attrib["source"]
@@ -620,31 +693,35 @@ class TiledTileset:
         self.image_source = source.parent / image_node.attrib["source"]
         self.image_width = int(image_node.attrib["width"])
         self.image_height = int(image_node.attrib["height"])
+        trans = image_node.attrib.get("trans")
+        self.image_trans = None if trans is None else pygame.color.Color(f"#{trans}")
         self.tiles = self.load_tiles()
 
-    def load_tiles(self: Self) -> dict[str, pygame.surface.Surface]:
-        surface = pygame.image.load(self.image_source).convert_alpha()
+    def load_tiles(self: Self) -> list[pygame.surface.Surface]:
+        # tiles are blitted every frame, give each one its own buffer in the display pixel format
+        image = pygame.image.load(self.image_source)
+        surface = image.convert_alpha() if self.image_trans is None else image.convert()
         tiles: list[pygame.surface.Surface] = []
         for y in range(0, self.image_height, self.tileheight):
             for x in range(0, self.image_width, self.tilewidth):
                 rect = pygame.FRect((x, y), (self.tilewidth, self.tileheight))
-                tile = surface.subsurface(rect)
+                tile = surface.subsurface(rect).copy()
+                if self.image_trans is not None:
+                    tile.set_colorkey(self.image_trans, pygame.constants.RLEACCEL)
                 tiles.append(tile)
-        return {str(i): tile for i, tile in enumerate(tiles, start=self.firstgid)}
-
-    def __getitem__(self: Self, gid: str) -> pygame.surface.Surface:
-        return self.tiles[gid]
+        return tiles
 
+    def __getitem__(self: Self, gid: int) -> pygame.surface.Surface:
+        index = gid - self.firstgid
+        if not 0 <= index < len(self.tiles):
+            msg = f"Tile GID {gid} not found in tileset {self.name}"
+            raise KeyError(msg)
+        return self.tiles[index]
 
-def load_tiles_data(value: str, width: int) -> list[tuple[str]]:
-    buf = StringIO(value.replace("\n", ""))
-    items = map(str.strip, chain.from_iterable(reader(buf)))
-    return reshape(items, width)
 
-
-def reshape[T](items: Iterable[T], n: int) -> list[tuple[T]]:
-    iterators = [items] * n
-    return [*zip(*iterators, strict=True)]
+def load_tiles_data(value: str) -> list[int]:
+    # int() ignores the surrounding whitespace and newlines of the csv cells
+    return [*map(int, value.split(","))]
 
 
 def parse_bool(value: str) -> bool:
@@ -657,95 +734,62 @@ def parse_bool(value: str) -> bool:
     raise ValueError(msg)
 
 
-def load_player_sprites() -> dict[tuple[MovementDirection, MovementStatus], list[pygame.surface.Surface]]:
+def load_player_sprites() -> list[list[list[pygame.surface.Surface]]]:
     image = pygame.image.load(PLAYER_SPRITE_FILENAME).convert_alpha()
     image.set_colorkey(PLAYER_COLORKEY)
     tile_width, tile_height = 16, 32
-    return {
-        (MovementDirection.DOWN, MovementStatus.IDLE): [
-            image.subsurface(pygame.rect.FRect(1 * tile_width, 0 * tile_height, tile_width, tile_height)),
-        ],
-        (MovementDirection.UP, MovementStatus.IDLE): [
-            image.subsurface(pygame.rect.FRect(1 * tile_width, 1 * tile_height, tile_width, tile_height)),
-        ],
-        (MovementDirection.LEFT, MovementStatus.IDLE): [
-            image.subsurface(pygame.rect.FRect(1 * tile_width, 2 * tile_height, tile_width, tile_height)),
-        ],
-        (MovementDirection.RIGHT, MovementStatus.IDLE): [
-            image.subsurface(pygame.rect.FRect(1 * tile_width, 3 * tile_height, tile_width, tile_height)),
-        ],
-        (MovementDirection.DOWN, MovementStatus.WALKING): [
-            image.subsurface(pygame.rect.FRect(0 * tile_width, 0 * tile_height, tile_width, tile_height)),
-            image.subsurface(pygame.rect.FRect(1 * tile_width, 0 * tile_height, tile_width, tile_height)),
-            image.subsurface(pygame.rect.FRect(2 * tile_width, 0 * tile_height, tile_width, tile_height)),
-            image.subsurface(pygame.rect.FRect(1 * tile_width, 0 * tile_height, tile_width, tile_height)),
-        ],
-        (MovementDirection.UP, MovementStatus.WALKING): [
-            image.subsurface(pygame.rect.FRect(0 * tile_width, 1 * tile_height, tile_width, tile_height)),
-            image.subsurface(pygame.rect.FRect(1 * tile_width, 1 * tile_height, tile_width, tile_height)),
-            image.subsurface(pygame.rect.FRect(2 * tile_width, 1 * tile_height, tile_width, tile_height)),
-            image.subsurface(pygame.rect.FRect(1 * tile_width, 1 * tile_height, tile_width, tile_height)),
-        ],
-        (MovementDirection.LEFT, MovementStatus.WALKING): [
-            image.subsurface(pygame.rect.FRect(0 * tile_width, 2 * tile_height, tile_width, tile_height)),
-            image.subsurface(pygame.rect.FRect(1 * tile_width, 2 * tile_height, tile_width, tile_height)),
-            image.subsurface(pygame.rect.FRect(2 * tile_width, 2 * tile_height, tile_width, tile_height)),
-            image.subsurface(pygame.rect.FRect(1 * tile_width, 2 * tile_height, tile_width, tile_height)),
-        ],
-        (MovementDirection.RIGHT, MovementStatus.WALKING): [
-            image.subsurface(pygame.rect.FRect(0 * tile_width, 3 * tile_height, tile_width, tile_height)),
-            image.subsurface(pygame.rect.FRect(1 * tile_width, 3 * tile_height, tile_width, tile_height)),
-            image.subsurface(pygame.rect.FRect(2 * tile_width, 3 * tile_height, tile_width, tile_height)),
-            image.subsurface(pygame.rect.FRect(1 * tile_width, 3 * tile_height, tile_width, tile_height)),
-        ],
-        (MovementDirection.DOWN, MovementStatus.RUNNING): [
-            image.subsurface(pygame.rect.FRect(3 * tile_width, 0 * tile_height, tile_width, tile_height)),
-            image.subsurface(pygame.rect.FRect(4 * tile_width, 0 * tile_height, tile_width, tile_height)),
-            image.subsurface(pygame.rect.FRect(5 * tile_width, 0 * tile_height, tile_width, tile_height)),
-            image.subsurface(pygame.rect.FRect(4 * tile_width, 0 * tile_height, tile_width, tile_height)),
-        ],
-        (MovementDirection.UP, MovementStatus.RUNNING): [
-            image.subsurface(pygame.rect.FRect(3 * tile_width, 1 * tile_height, tile_width, tile_height)),
-            image.subsurface(pygame.rect.FRect(4 * tile_width, 1 * tile_height, tile_width, tile_height)),
-            image.subsurface(pygame.rect.FRect(5 * tile_width, 1 * tile_height, tile_width, tile_height)),
-            image.subsurface(pygame.rect.FRect(4 * tile_width, 1 * tile_height, tile_width, tile_height)),
-        ],
-        (MovementDirection.LEFT, MovementStatus.RUNNING): [
-            image.subsurface(pygame.rect.FRect(3 * tile_width, 2 * tile_height, tile_width, tile_height)),
-            image.subsurface(pygame.rect.FRect(4 * tile_width, 2 * tile_height, tile_width, tile_height)),
-            image.subsurface(pygame.rect.FRect(5 * tile_width, 2 * tile_height, tile_width, tile_height)),
-            image.subsurface(pygame.rect.FRect(4 * tile_width, 2 * tile_height, tile_width, tile_height)),
-        ],
-        (MovementDirection.RIGHT, MovementStatus.RUNNING): [
-            image.subsurface(pygame.rect.FRect(3 * tile_width, 3 * tile_height, tile_width, tile_height)),
-            image.subsurface(pygame.rect.FRect(4 * tile_width, 3 * tile_height, tile_width, tile_height)),
-            image.subsurface(pygame.rect.FRect(5 * tile_width, 3 * tile_height, tile_width, tile_height)),
-            image.subsurface(pygame.rect.FRect(4 * tile_width, 3 * tile_height, tile_width, tile_height)),
-        ],
-    }
+    frames = [
+        [
+            image.subsurface((x * tile_width, y * tile_height, tile_width, tile_height))
+            for x in range(image.get_width() // tile_width)
+        ]
+        for y in range(image.get_height() // tile_height)
+    ]
+    # one row per MovementDirection, one list per MovementStatus
+    return [
+        [
+            [row[1]],
+            [row[0], row[1], row[2], row[1]],
+            [row[3], row[4], row[5], row[4]],
+        ]
+        for row in frames[: len(MovementDirection)]
+    ]
 
 
 def get_min_area(items: Sequence[pygame.rect.FRect]) -> pygame.rect.FRect:
-    min_x = min(rect.left for rect in items)
-    max_x = max(rect.right for rect in items)
-    min_y = min(rect.top for rect in items)
-    max_y = max(rect.bottom for rect in items)
-    return pygame.rect.FRect(0, 0, max_x - min_x, max_y - min_y)
+    first, *rest = items
+    return pygame.rect.FRect((0, 0), first.unionall(rest).size)
 
 
 def draw_grid(
     surface: pygame.surface.Surface,
-    offset: pygame.math.Vector2 | None = None,
+    offset: Point = (0, 0),
     tile_size: int = _TILE_SIZE,
 ) -> None:
-    rect = surface.get_frect()
-    if offset is None:
-        offset = pygame.math.Vector2(0, 0)
-    width, height = rect.size
-    for x in range(int(offset.x % tile_size), int(width), tile_size):
+    width, height = surface.get_size()
+    ox, oy = offset
+    # one tile bigger than the surface, so it still covers it after shifting back by up to a tile
+    grid = _get_grid_surface((width + tile_size, height + tile_size), tile_size)
+    _ = surface.blit(grid, (int(ox % tile_size) - tile_size, int(oy % tile_size) - tile_size))
+
+
+@cache
+def _get_placeholder_surface() -> pygame.surface.Surface:
+    # shared by every tile created without a surface, tiles never draw on their surface
+    surface = pygame.surface.Surface(TILE_SIZE).convert()
+    _ = surface.fill(MAGENTA)
+    return surface
+
+
+@cache
+def _get_grid_surface(size: tuple[int, int], tile_size: int) -> pygame.surface.Surface:
+    surface = pygame.surface.Surface(size, pygame.constants.SRCALPHA).convert_alpha()
+    width, height = size
+    for x in range(0, width, tile_size):
         _ = pygame.draw.line(surface, color=BLACK, start_pos=(x, 0), end_pos=(x, height), width=1)
-    for y in range(int(offset.y % tile_size), int(height), tile_size):
+    for y in range(0, height, tile_size):
         _ = pygame.draw.line(surface, color=BLACK, start_pos=(0, y), end_pos=(width, y), width=1)
+    return surface
 
 
 def debug_hitboxes(collision_group: CollisionGroup, camera: Camera) -> None:
@@ -754,18 +798,22 @@ def debug_hitboxes(collision_group: CollisionGroup, camera: Camera) -> None:
 
 
 def debug(value: str, pos: Point = (10, 10)) -> None:
-    global _debug_font  # noqa: PLW0603
-    if _debug_font is None:
-        _debug_font = pygame.font.Font(pygame.font.get_default_font())
     surface = pygame.display.get_surface()
     if surface is None:
         msg = "No display surface"
         raise RuntimeError(msg)
-    text = _debug_font.render(value, antialias=True, color=WHITE, bgcolor=BLACK)
-    _ = surface.blit(text, pos)
+    _ = surface.blit(_render_debug_text(value), pos)
+
+
+@lru_cache(maxsize=64)
+def _render_debug_text(value: str) -> pygame.surface.Surface:
+    # debug values repeat across frames, rasterize each one once
+    return _get_debug_font().render(value, antialias=True, color=WHITE, bgcolor=BLACK)
 
 
-_debug_font: pygame.font.Font | None = None
+@cache
+def _get_debug_font() -> pygame.font.Font:
+    return pygame.font.Font(pygame.font.get_default_font())
 
 
 def main() -> None:
@@ -8,14 +8,13 @@
 # - interaction with npcs
 # - multi height map
 # - combine npc battles into one single battle
-# - update get_pressed to use events ?
 # - separate window from game logic
 # - optimize drawing (only redraw changed parts)
 
 from abc import ABC
 from abc import abstractmethod
-from enum import StrEnum
-from enum import auto
+from enum import IntEnum
+from functools import cache
 from itertools import chain
 from operator import itemgetter
 from typing import Any
@@ -28,16 +27,24 @@ from uuid import UUID
 from uuid import uuid4
 
 import pygame
-import pygame.base
 import pygame.color
 import pygame.constants
 import pygame.display
 import pygame.event
-import pygame.key
-import pygame.math
+import pygame.font
 import pygame.surface
 import pygame.time
 import pygame.typing
+from pygame.constants import K_DOWN
+from pygame.constants import K_ESCAPE
+from pygame.constants import K_LEFT
+from pygame.constants import K_LSHIFT
+from pygame.constants import K_RETURN
+from pygame.constants import K_RIGHT
+from pygame.constants import K_SPACE
+from pygame.constants import K_TAB
+from pygame.constants import K_UP
+from pygame.constants import K_q
 
 BLACK = pygame.color.Color(64, 64, 64)
 GREY = pygame.color.Color(128, 128, 128)
@@ -52,6 +59,8 @@ YELLOW = pygame.color.Color(240, 240, 64)
 _TILE_SIZE = 32
 TILE_SIZE = (_TILE_SIZE, _TILE_SIZE)
 WINDOW_SIZE = (30 * _TILE_SIZE, 20 * _TILE_SIZE)
+_MARKER_SIZE = _TILE_SIZE // 4  # route and line of sight markers, centered on their tile
+_MARKER_OFFSET = (_TILE_SIZE - _MARKER_SIZE) // 2
 FPS = 60
 
 WALL_COLOR = WHITE
@@ -72,10 +81,33 @@ ALERT_SPRITE_TIME = 0.6
 ANIMATION_SPEED = 4.0
 
 
+class KeyState:
+    """Pressed keys, tracked from the key events instead of polling the keyboard every frame"""
+
+    _pressed: set[int]
+
+    def __init__(self: Self) -> None:
+        self._pressed = set()
+
+    def __getitem__(self: Self, key: int) -> bool:
+        return key in self._pressed
+
+    def handle_events(self: Self, events: list[pygame.event.Event]) -> None:
+        for event in events:
+            if event.type == pygame.constants.KEYDOWN:
+                self._pressed.add(event.key)  # pyright: ignore[reportAny]
+            elif event.type == pygame.constants.KEYUP:
+                self._pressed.discard(event.key)  # pyright: ignore[reportAny]
+            elif event.type == pygame.constants.WINDOWFOCUSLOST:
+                # keys released while unfocused send no KEYUP, they would stay pressed
+                self._pressed.clear()
+
+
 class Window:
     surface: pygame.surface.Surface
     font: pygame.font.Font
     clock: pygame.time.Clock
+    keys: KeyState
     _running: bool
 
     def __init__(
@@ -86,27 +118,37 @@ class Window:
         self.surface = surface
         self.font = font
         self.clock = pygame.time.Clock()
+        self.keys = KeyState()
         self._running = False
 
     def run(self: Self) -> None:
         dt = 0
         self._running = True
+        # bind the per frame calls once, the loop runs for the whole game
+        get_events = pygame.event.get
+        keys = self.keys
+        flip = pygame.display.flip
+        update_display = pygame.display.update
+        tick = self.clock.tick
         while self._running:
-            events = pygame.event.get()
-            keys = pygame.key.get_pressed()
+            events = get_events()
+            keys.handle_events(events)
             self.handle_events(events)
             self.handle_keys(keys)
             _ = self.update(dt)
             self.draw(dt)
-            pygame.display.flip()
-            dt = self.clock.tick(FPS) / 1000
+            if (dirty_rects := self.get_dirty_rects()) is None:
+                flip()
+            else:
+                update_display(dirty_rects)
+            dt = tick(FPS) / 1000
 
     def handle_events(self: Self, events: list[pygame.event.Event]) -> None:
         for event in events:
             if event.type == pygame.constants.QUIT:
                 self.quit()
 
-    def handle_keys(self: Self, keys: pygame.key.ScancodeWrapper) -> None:  # pyright: ignore[reportUnusedParameter]
+    def handle_keys(self: Self, keys: KeyState) -> None:  # pyright: ignore[reportUnusedParameter]
         pass
 
     def update(self: Self, dt: float) -> bool:  # pyright: ignore[reportUnusedParameter]  # noqa: ARG002
@@ -116,12 +158,21 @@ class Window:
     def draw(self: Self, dt: float) -> None:  # pyright: ignore[reportUnusedParameter]
         pass
 
+    def get_dirty_rects(self: Self) -> list[pygame.rect.Rect] | None:
+        """Return the window areas changed by the last draw, None when the whole window changed"""
+        return None
+
     def quit(self: Self) -> None:
         self._running = False
 
 
 class GameWindow(Window):
     state_manager: GameStateManager
+    _character_blits: list[tuple[pygame.surface.Surface, pygame.typing.Point]]  # reused every frame
+    _frame_surface: pygame.surface.Surface | None = None  # map sized, reused every frame
+    _viewport: tuple[MapData, pygame.rect.Rect] | None = None  # None updates the whole window next frame
+    _dynamic_rects: list[pygame.rect.FRect]  # map areas of the characters and markers on the last frame
+    _dirty_rects: list[pygame.rect.Rect] | None = None
 
     def __init__(self: Self) -> None:
         pygame.display.set_caption("The Game")
@@ -129,14 +180,16 @@ class GameWindow(Window):
         font = pygame.font.Font(pygame.font.get_default_font())
         super().__init__(surface, font)
         self.state_manager = GameStateManager(main_window=self)
+        self._character_blits = []
+        self._dynamic_rects = []
 
     @override
     def handle_events(self: Self, events: list[pygame.event.Event]) -> None:
         _ = self.state_manager.handle_events(events)
 
     @override
-    def handle_keys(self: Self, keys: pygame.key.ScancodeWrapper) -> None:
-        if keys[pygame.constants.K_ESCAPE] or keys[pygame.constants.K_q]:
+    def handle_keys(self: Self, keys: KeyState) -> None:
+        if keys[K_ESCAPE] or keys[K_q]:
             self.quit()
             return
         _ = self.state_manager.handle_keys(keys)
@@ -147,64 +200,119 @@ class GameWindow(Window):
 
     @override
     def draw(self: Self, dt: float) -> None:
-        width, height = self.state_manager.map_data.get_size()
-        map_rect = pygame.rect.FRect((0, 0), (width * _TILE_SIZE, height * _TILE_SIZE))
-        map_surface = pygame.surface.Surface(map_rect.size)
-        _ = map_surface.fill(BLACK)
-        self.draw_map(map_surface, dt)
-        self.draw_grid(map_surface, dt)
-        self.draw_lancer_path(map_surface, dt)
-        self.draw_lancer_line_of_sight(map_surface, dt)
-        self.draw_characters(map_surface, dt)
-        _ = self.state_manager.draw_on_map(map_surface, dt)
+        state_manager = self.state_manager
+        if not state_manager.redraw:
+            self._dirty_rects = []  # the window already shows this frame
+            return
+        # game events animate and draw over the window, keep drawing until the frame after they are gone
+        state_manager.redraw = bool(state_manager.game_events)
+        map_surface = self.get_frame_surface()
         viewport_rect = self.surface.get_rect()
         viewport_rect.center = self.state_manager.player.rect.topleft
-        viewport_rect.clamp_ip(map_rect)
+        viewport_rect.clamp_ip(map_surface.get_rect())
+        # only the viewport is shown, restore that part of the pre-rendered map and skip markers outside it
+        _ = map_surface.blit(self.state_manager.map_data.surface, viewport_rect, area=viewport_rect)
+        self.draw_lancer_path(map_surface, viewport_rect, dt)
+        self.draw_lancer_line_of_sight(map_surface, viewport_rect, dt)
+        self.draw_characters(map_surface, dt)
+        _ = self.state_manager.draw_on_map(map_surface, dt)
         _ = self.surface.blit(map_surface, area=viewport_rect)
         _ = self.state_manager.draw_on_window(self.surface, dt)
+        self.update_dirty_rects(viewport_rect)
+
+    @override
+    def get_dirty_rects(self: Self) -> list[pygame.rect.Rect] | None:
+        return self._dirty_rects
+
+    def update_dirty_rects(self: Self, viewport_rect: pygame.rect.Rect) -> None:
+        dynamic_rects = self.get_dynamic_rects()
+        viewport = (self.state_manager.map_data, viewport_rect)
+        if viewport != self._viewport or self.state_manager.game_events:
+            self._dirty_rects = None
+        else:
+            offset = (-viewport_rect.x, -viewport_rect.y)
+            dirty_rects = [
+                pygame.rect.Rect(rect.move(offset)).inflate(2, 2)  # covers the rounding of float positions
+                for rect in chain(self._dynamic_rects, dynamic_rects)
+            ]
+            # past half of the window a single flip is cheaper than updating every rect
+            dirty_area = sum(rect.width * rect.height for rect in dirty_rects)
+            window_area = self.surface.get_width() * self.surface.get_height()
+            self._dirty_rects = None if dirty_area * 2 > window_area else dirty_rects
+        self._dynamic_rects = dynamic_rects
+        # game events draw over the window, update it whole until the frame after the last one is gone
+        self._viewport = None if self.state_manager.game_events else viewport
+
+    def get_dynamic_rects(self: Self) -> list[pygame.rect.FRect]:
+        """Return the map areas that can change while the viewport stays in place, one per character"""
+        rects = [self.state_manager.player.rect.copy()]
+        rects.extend(
+            lancer.rect.unionall(
+                [
+                    _get_marker_rect(lancer.next_patrol_position()),
+                    *map(_get_marker_rect, lancer.get_line_of_sight()),
+                ],
+            )
+            for lancer in self.state_manager.lancers
+        )
+        return rects
 
-    def draw_map(self: Self, surface: pygame.surface.Surface, dt: float) -> None:  # pyright: ignore[reportUnusedParameter]  # noqa: ARG002
-        for (x, y), tile in self.state_manager.map_data.data.items():
-            if tile == TileType.WALL:
-                rect = pygame.rect.FRect((x * _TILE_SIZE, y * _TILE_SIZE), TILE_SIZE)
-                _ = pygame.draw.rect(surface, WALL_COLOR, rect)
-            elif tile == TileType.WARP:
-                rect = pygame.rect.FRect((x * _TILE_SIZE, y * _TILE_SIZE), TILE_SIZE)
-                _ = pygame.draw.rect(surface, FLOOR_COLOR, rect)
-                _ = pygame.draw.circle(surface, BLUE, rect.center, _TILE_SIZE // 4)
+    def get_frame_surface(self: Self) -> pygame.surface.Surface:
+        """Return the surface the map is drawn on, only allocated again when the map size changes"""
+        size = self.state_manager.map_data.surface.get_size()
+        if self._frame_surface is None or self._frame_surface.get_size() != size:
+            self._frame_surface = pygame.surface.Surface(size).convert()
+        return self._frame_surface
 
     def draw_characters(self: Self, surface: pygame.surface.Surface, dt: float) -> None:  # pyright: ignore[reportUnusedParameter]  # noqa: ARG002
+        player, lancers = self.state_manager.player, self.state_manager.lancers
+        blits = self._character_blits
+        if len(blits) != len(lancers) + 1:  # the lancers only change with the map
+            blits[:] = [(player.surface, player.rect.topleft)] * (len(lancers) + 1)
+        for index, lancer in enumerate(lancers):
+            blits[index] = (lancer.surface, lancer.rect.topleft)
+        blits[-1] = (player.surface, player.rect.topleft)
+        surface.fblits(blits)
+
+    def draw_lancer_path(
+        self: Self,
+        surface: pygame.surface.Surface,
+        viewport_rect: pygame.rect.Rect,
+        dt: float,  # pyright: ignore[reportUnusedParameter]  # noqa: ARG002
+    ) -> None:
+        route_marker, route_next_marker, _ = _get_marker_surfaces()
+        blits: list[tuple[pygame.surface.Surface, pygame.typing.Point]] = []
         for lancer in self.state_manager.lancers:
-            _ = surface.blit(lancer.surface, lancer.rect)
-        _ = surface.blit(self.state_manager.player.surface, self.state_manager.player.rect)
-
-    def draw_grid(self: Self, surface: pygame.surface.Surface, dt: float) -> None:  # pyright: ignore[reportUnusedParameter]  # noqa: ARG002
-        rect = surface.get_rect()
-        for x in range(0, rect.width, _TILE_SIZE):
-            _ = pygame.draw.line(surface, BLUE, (x, 0), (x, rect.height))
-        for y in range(0, rect.height, _TILE_SIZE):
-            _ = pygame.draw.line(surface, BLUE, (0, y), (rect.width, y))
-
-    def draw_lancer_path(self: Self, surface: pygame.surface.Surface, dt: float) -> None:  # pyright: ignore[reportUnusedParameter]  # noqa: ARG002
-        inflate = -_TILE_SIZE * 0.75
-        for lancer in self.state_manager.lancers:
-            for position in lancer.patrol_route.items:
-                x, y = position
-                pos = (x * _TILE_SIZE, y * _TILE_SIZE)
-                rect = pygame.rect.FRect(pos, TILE_SIZE).inflate(inflate, inflate)
-                if position == lancer.patrol_route.next():
-                    _ = pygame.draw.rect(surface, LANCER_ROUTE_NEXT_COLOR, rect)
-                else:
-                    _ = pygame.draw.rect(surface, LANCER_ROUTE_COLOR, rect)
+            if not viewport_rect.colliderect(lancer.route_rect):
+                continue
+            next_position = lancer.next_patrol_position()
+            blits.extend(
+                (route_next_marker if position == next_position else route_marker, marker_position)
+                for position, marker_position in zip(
+                    lancer.patrol_route,
+                    lancer.route_marker_positions,
+                    strict=True,
+                )
+            )
+        surface.fblits(blits)
 
-    def draw_lancer_line_of_sight(self: Self, surface: pygame.surface.Surface, dt: float) -> None:  # pyright: ignore[reportUnusedParameter]  # noqa: ARG002
-        inflate = -_TILE_SIZE * 0.75
-        for lancer in self.state_manager.lancers:
-            for position in lancer.get_line_of_sight():
-                x, y = position
-                pos = (x * _TILE_SIZE, y * _TILE_SIZE)
-                rect = pygame.rect.FRect(pos, TILE_SIZE).inflate(inflate, inflate)
-                _ = pygame.draw.rect(surface, LANCER_RAYCAST_COLOR, rect, width=1)
+    def draw_lancer_line_of_sight(
+        self: Self,
+        surface: pygame.surface.Surface,
+        viewport_rect: pygame.rect.Rect,
+        dt: float,  # pyright: ignore[reportUnusedParameter]  # noqa: ARG002
+    ) -> None:
+        _, _, raycast_marker = _get_marker_surfaces()
+        # the tiles overlapping the viewport
+        left, top = viewport_rect.left // _TILE_SIZE, viewport_rect.top // _TILE_SIZE
+        right, bottom = (viewport_rect.right - 1) // _TILE_SIZE, (viewport_rect.bottom - 1) // _TILE_SIZE
+        blits = [
+            (raycast_marker, (x * _TILE_SIZE + _MARKER_OFFSET, y * _TILE_SIZE + _MARKER_OFFSET))
+            for lancer in self.state_manager.lancers
+            for x, y in lancer.get_line_of_sight()
+            if left <= x <= right and top <= y <= bottom
+        ]
+        surface.fblits(blits)
 
 
 class StateManager(ABC):
@@ -213,7 +321,7 @@ class StateManager(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def handle_keys(self: Self, keys: pygame.key.ScancodeWrapper) -> bool:
+    def handle_keys(self: Self, keys: KeyState) -> bool:
         raise NotImplementedError
 
     @abstractmethod
@@ -246,20 +354,19 @@ class GameStateManager(StateManager):
     player: Player
     _map_name: str
     _map_data_cache: dict[str, MapData]
+    _lancers_occupied: set[pygame.typing.Point] | None = None  # lancer tiles and move targets, None if stale
+    redraw: bool = True  # set when anything drawn on the map changed, cleared by the window once drawn
 
     def __init__(self: Self, main_window: Window) -> None:
         self.main_window = main_window
         self.state = GameState.overworld
         self.game_events = []
-        self._map_data_cache = {
-            MAP1_NAME: MapData(map_data=MAP1_DATA, lancer_routes=MAP1_LANCER_ROUTES),
-            MAP2_NAME: MapData(map_data=MAP2_DATA, lancer_routes=[]),
-        }
+        self._map_data_cache = {}
         self.load_map(MAP1_NAME)
 
     def load_map(self: Self, map_name: str) -> None:
         self._map_name = map_name
-        self.map_data = self._map_data_cache[map_name]
+        self.map_data = self.get_map_data(map_name)
         self.lancers = [
             Lancer(game_state_manager=self, position=position, route=route)
             for position, route in zip(
@@ -269,45 +376,56 @@ class GameStateManager(StateManager):
             )
         ]
         self.player = Player(game_state_manager=self, position=self.map_data.player_position)
+        self.invalidate__lancers_occupied()
+        self.redraw = True
+
+    def get_map_data(self: Self, map_name: str) -> MapData:
+        # maps are parsed and rendered the first time they are loaded, not when the game starts
+        if map_name not in self._map_data_cache:
+            map_data, lancer_routes = MAPS[map_name]
+            self._map_data_cache[map_name] = MapData(map_data=map_data, lancer_routes=lancer_routes)
+        return self._map_data_cache[map_name]
+
+    def push__game_events(self: Self, *items: StateManager) -> None:
+        # every game event goes through here, so their overlays are drawn even if nothing moved this frame
+        self.game_events.extend(items)
+        self.state = GameState.game_event
+        self.redraw = True
 
     @override
     def handle_events(self: Self, events: list[pygame.event.Event]) -> bool:
         return True
 
     @override
-    def handle_keys(self: Self, keys: pygame.key.ScancodeWrapper) -> bool:
+    def handle_keys(self: Self, keys: KeyState) -> bool:
         if self.state == GameState.game_event:
             return self.handle_keys__game_events(keys)
         if self.state == GameState.overworld:
-            if keys[pygame.constants.K_RETURN] and not self.player.is_moving:
-                self.game_events.append(PauseMenu(self.main_window.font))
-                self.state = GameState.game_event
+            if keys[K_RETURN] and not self.player.is_moving:
+                self.push__game_events(PauseMenu(self.main_window.font))
                 return False
             return self.handle_keys__player(keys)
         return True
 
-    def handle_keys__game_events(self: Self, keys: pygame.key.ScancodeWrapper) -> bool:
+    def handle_keys__game_events(self: Self, keys: KeyState) -> bool:
         for item in self.game_events:
             if not item.handle_keys(keys):
                 self.game_events.remove(item)
             break
         return True
 
-    def handle_keys__player(self: Self, keys: pygame.key.ScancodeWrapper) -> bool:
+    def handle_keys__player(self: Self, keys: KeyState) -> bool:
         if not self.player.is_moving:
             x, y = self.player.position
-            if keys[pygame.constants.K_DOWN]:
+            if keys[K_DOWN]:
                 _ = self.player.move((x, y + 1))
-            elif keys[pygame.constants.K_UP]:
+            elif keys[K_UP]:
                 _ = self.player.move((x, y - 1))
-            elif keys[pygame.constants.K_RIGHT]:
+            elif keys[K_RIGHT]:
                 _ = self.player.move((x + 1, y))
-            elif keys[pygame.constants.K_LEFT]:
+            elif keys[K_LEFT]:
                 _ = self.player.move((x - 1, y))
-        if keys[pygame.constants.K_LSHIFT]:
-            self.player.movement_type = MovementType.RUNNING
-        else:
-            self.player.movement_type = MovementType.WALKING
+        self.player.set_movement_type(MovementType.RUNNING if keys[K_LSHIFT] else MovementType.WALKING)
         return True
 
     @override
@@ -322,7 +440,9 @@ class GameStateManager(StateManager):
 
     def update__game_events(self: Self, dt: float) -> bool:
         if not self.game_events:
-            self.state = GameState.overworld
+            if self.state != GameState.overworld:
+                self.state = GameState.overworld
+                self.redraw = True
             return True
         for item in self.game_events:
             if not item.update(dt):
@@ -339,6 +459,20 @@ class GameStateManager(StateManager):
         _ = self.player.update(dt)
         return True
 
+    def get__lancers_occupied(self: Self) -> set[pygame.typing.Point]:
+        # rebuilt only after a lancer moved, most frames the player walkability checks reuse the set
+        if self._lancers_occupied is None:
+            self._lancers_occupied = {
+                position
+                for lancer in self.lancers
+                for position in (lancer.position, lancer.next_position)
+                if position is not None
+            }
+        return self._lancers_occupied
+
+    def invalidate__lancers_occupied(self: Self) -> None:
+        self._lancers_occupied = None
+
     @override
     def dispatch(self: Self, dt: float) -> bool:
         if self.state == GameState.game_event:
@@ -361,11 +495,10 @@ class GameStateManager(StateManager):
             for lancer in self.lancers
             if not lancer.is_moving
             and lancer.state == LancerState.patrolling
-            and self.player.position in lancer.get_line_of_sight()
+            and lancer.can_see(self.player.position)
         ]:
-            self.state = GameState.game_event
-            self.game_events.extend(
-                chain(
+            self.push__game_events(
+                *chain(
                     chain.from_iterable(
                         (
                             AlertSprite(lancer),
@@ -382,9 +515,9 @@ class GameStateManager(StateManager):
             if lancer.is_moving:
                 continue
             if lancer.state == LancerState.patrolling:
-                next_position = next(lancer.patrol_route)
+                next_position = lancer.next_patrol_position()
                 if lancer.move(next_position):
-                    lancer.patrol_route.advance()
+                    lancer.advance_patrol()
         return True
 
     @override
@@ -408,14 +541,7 @@ class GameStateManager(StateManager):
         position: pygame.typing.Point,
         collision_type: Literal["player", "lancer"],
     ) -> bool:
-        if collision_type == "player" and any(
-            position == p
-            for lancer in self.lancers
-            for p in (
-                lancer.position,
-                lancer.next_position,
-            )
-        ):
+        if collision_type == "player" and position in self.get__lancers_occupied():
             return False
         if collision_type == "lancer" and position in (self.player.position, self.player.next_position):
             return False
@@ -431,7 +557,7 @@ class PauseMenu(StateManager):
     def __init__(self: Self, font: pygame.font.Font) -> None:
         main_window_rect = pygame.rect.FRect((0, 0), WINDOW_SIZE)
         rect = pygame.rect.FRect((0, 0), (main_window_rect.width * 0.2, main_window_rect.height * 0.8))
-        self.surface = pygame.surface.Surface(rect.size)
+        self.surface = pygame.surface.Surface(rect.size).convert()
         self.rect = rect
         self.font = font
         self.rect.midright = main_window_rect.midright
@@ -450,8 +576,8 @@ class PauseMenu(StateManager):
         return True
 
     @override
-    def handle_keys(self: Self, keys: pygame.key.ScancodeWrapper) -> bool:
-        return not keys[pygame.constants.K_SPACE]
+    def handle_keys(self: Self, keys: KeyState) -> bool:
+        return not keys[K_SPACE]
 
     @override
     def update(self: Self, dt: float) -> bool:
@@ -499,7 +625,7 @@ class AlertSprite(StateManager):
         return True
 
     @override
-    def handle_keys(self: Self, keys: pygame.key.ScancodeWrapper) -> bool:
+    def handle_keys(self: Self, keys: KeyState) -> bool:
         return True
 
     @override
@@ -534,7 +660,7 @@ class AlertChase(StateManager):
         return True
 
     @override
-    def handle_keys(self: Self, keys: pygame.key.ScancodeWrapper) -> bool:
+    def handle_keys(self: Self, keys: KeyState) -> bool:
         return True
 
     @override
@@ -583,7 +709,7 @@ class AlertDialog(StateManager):
         self.text = text
         main_window_rect = pygame.rect.FRect((0, 0), WINDOW_SIZE)
         rect = pygame.rect.FRect((0, 0), (main_window_rect.width * 0.8, main_window_rect.height * 0.2))
-        self.surface = pygame.surface.Surface(rect.size)
+        self.surface = pygame.surface.Surface(rect.size).convert()
         self.rect = rect
         self.font = font
         self.rect.midbottom = main_window_rect.midbottom
@@ -601,8 +727,8 @@ class AlertDialog(StateManager):
         return True
 
     @override
-    def handle_keys(self: Self, keys: pygame.key.ScancodeWrapper) -> bool:
-        return not (keys[pygame.constants.K_SPACE] or keys[pygame.constants.K_RETURN])
+    def handle_keys(self: Self, keys: KeyState) -> bool:
+        return not (keys[K_SPACE] or keys[K_RETURN])
 
     @override
     def update(self: Self, dt: float) -> bool:
@@ -632,7 +758,7 @@ class Battle(StateManager):
     def __init__(self: Self, font: pygame.font.Font, lancers: list[Lancer]) -> None:
         main_window_rect = pygame.rect.FRect((0, 0), WINDOW_SIZE)
         rect = pygame.rect.FRect((0, 0), (main_window_rect.width * 0.9, main_window_rect.height * 0.9))
-        self.surface = pygame.surface.Surface(rect.size)
+        self.surface = pygame.surface.Surface(rect.size).convert()
         self.rect = rect
         self.font = font
         self.rect.center = main_window_rect.center
@@ -652,8 +778,8 @@ class Battle(StateManager):
         return True
 
     @override
-    def handle_keys(self: Self, keys: pygame.key.ScancodeWrapper) -> bool:
-        return not keys[pygame.constants.K_TAB]
+    def handle_keys(self: Self, keys: KeyState) -> bool:
+        return not keys[K_TAB]
 
     @override
     def update(self: Self, dt: float) -> bool:
@@ -674,53 +800,126 @@ class Battle(StateManager):
 
 
 class MapData:
-    data: dict[pygame.typing.Point, TileType]
+    grid: bytes  # TileType values indexed by y * width + x, characters stand on EMPTY tiles
+    width: int
+    height: int
     lancer_positions: list[pygame.typing.Point]
-    lancer_routes: list[list[pygame.typing.Point]]
+    lancer_routes: list[tuple[pygame.typing.Point, ...]]
     player_position: pygame.typing.Point
+    reach: tuple[list[int], ...]  # indexed by Direction then y * width + x, walkable tiles before a wall
+    surface: pygame.surface.Surface
 
-    def __init__(self: Self, map_data: str, lancer_routes: list[str]) -> None:
-        self.data = {}
+    def __init__(self: Self, map_data: bytes, lancer_routes: list[bytes]) -> None:
         self.lancer_positions = []
-        self.lancer_routes = []
+        self.lancer_routes = [parse_lancer_route(route) for route in lancer_routes]
         self.load_map(map_data)
-        self.load_lancer_routes(lancer_routes)
-
-    def load_map(self: Self, map_data: str) -> None:
-        for y, row in enumerate(map_data.strip().splitlines()):
+        self.reach = self.compute_reach()
+        self.surface = self.render()
+
+    def load_map(self: Self, map_data: bytes) -> None:
+        rows = map_data.strip().splitlines()
+        self.width = len(rows[0])
+        self.height = len(rows)
+        if any(len(row) != self.width for row in rows):
+            msg = "Map rows must all have the same width"
+            raise ValueError(msg)
+        grid = bytearray()
+        for y, row in enumerate(rows):
             for x, tile in enumerate(map(TileType, row)):
-                if tile in (TileType.EMPTY, TileType.WALL, TileType.WARP):
-                    self.data[(x, y)] = TileType(tile)
-                elif tile in (TileType.LANCER1, TileType.LANCER2):
+                if tile in (TileType.LANCER1, TileType.LANCER2):
                     self.lancer_positions.append((x, y))
+                    grid.append(TileType.EMPTY)
                 elif tile == TileType.PLAYER:
                     self.player_position = (x, y)
-
-    def load_lancer_routes(self: Self, lancer_routes: list[str]) -> None:
-        for path in lancer_routes:
-            items = [
-                ((x, y), sequence)
-                for y, row in enumerate(path.strip().splitlines())
-                for x, sequence in enumerate(row)
-                if sequence not in (".",)
-            ]
-            items = sorted(items, key=itemgetter(1))
-            self.lancer_routes.append([*map(itemgetter(0), items)])
+                    grid.append(TileType.EMPTY)
+                else:
+                    grid.append(tile)
+        self.grid = bytes(grid)
+
+    def compute_reach(self: Self) -> tuple[list[int], ...]:
+        """Count the walkable tiles in a straight line from every tile, per direction"""
+        width, height, grid = self.width, self.height, self.grid
+        reach = tuple([0] * (width * height) for _ in Direction)
+        down, up, right, left = (reach[d] for d in Direction)
+        for y in range(height):
+            run = 0
+            for x in range(width):
+                left[y * width + x] = run
+                run = 0 if grid[y * width + x] == TileType.WALL else run + 1
+            run = 0
+            for x in reversed(range(width)):
+                right[y * width + x] = run
+                run = 0 if grid[y * width + x] == TileType.WALL else run + 1
+        for x in range(width):
+            run = 0
+            for y in range(height):
+                up[y * width + x] = run
+                run = 0 if grid[y * width + x] == TileType.WALL else run + 1
+            run = 0
+            for y in reversed(range(height)):
+                down[y * width + x] = run
+                run = 0 if grid[y * width + x] == TileType.WALL else run + 1
+        return reach
+
+    def get_reach(self: Self, position: pygame.typing.Point, direction: Direction) -> int:
+        x, y = int(position[0]), int(position[1])
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.reach[direction][y * self.width + x]
+        return 0
+
+    def render(self: Self) -> pygame.surface.Surface:
+        """Draw the static tiles and grid, must be called after the display mode is set"""
+        width, height = self.get_size()
+        surface = pygame.surface.Surface((width * _TILE_SIZE, height * _TILE_SIZE)).convert()
+        _ = surface.fill(BLACK)
+        tiles = _get_tile_surfaces()
+        blits = [
+            (tiles[tile], ((index % width) * _TILE_SIZE, (index // width) * _TILE_SIZE))
+            for index, tile in enumerate(self.grid)
+            if tile in tiles
+        ]
+        surface.fblits(blits)
+        surface_width, surface_height = surface.get_size()
+        for x in range(0, surface_width, _TILE_SIZE):
+            _ = surface.fill(BLUE, (x, 0, 1, surface_height))
+        for y in range(0, surface_height, _TILE_SIZE):
+            _ = surface.fill(BLUE, (0, y, surface_width, 1))
+        return surface
 
     def get_size(self: Self) -> pygame.typing.Point:
         return (self.get_width(), self.get_height())
 
-    def get_width(self: Self) -> float:
-        return max(x for x, _ in self.data) + 1
+    def get_width(self: Self) -> int:
+        return self.width
 
-    def get_height(self: Self) -> float:
-        return max(y for _, y in self.data) + 1
+    def get_height(self: Self) -> int:
+        return self.height
+
+    def get_tile(self: Self, position: pygame.typing.Point) -> int | None:
+        """Return the tile at position, None outside the map"""
+        x, y = position
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.grid[int(y) * self.width + int(x)]
+        return None
 
     def is_walkable(self: Self, position: pygame.typing.Point) -> bool:
-        return self.data.get(position) != TileType.WALL
+        tile = self.get_tile(position)
+        return tile is not None and tile != TileType.WALL
 
     def is_warp(self: Self, position: pygame.typing.Point) -> bool:
-        return self.data.get(position) == TileType.WARP
+        return self.get_tile(position) == TileType.WARP
+
+    def cast_ray(
+        self: Self,
+        position: pygame.typing.Point,
+        direction: Direction,
+        distance: int,
+    ) -> list[pygame.typing.Point]:
+        """Return the tiles after position towards direction, stopping at distance or the first wall"""
+        x, y = position
+        dx, dy = _DIRECTION_OFFSETS[direction]
+        steps = min(distance, self.get_reach(position, direction))
+        return [(x + dx * i, y + dy * i) for i in range(1, steps + 1)]
 
 
 class Character:
@@ -733,24 +932,26 @@ class Character:
     hitbox: pygame.rect.FRect
     direction: Direction
     movement_type: MovementType
+    speed: float  # movement_type.speed(), kept in sync by set_movement_type
     next_position: pygame.typing.Point | None = None  # for grid & collision
     next_hitbox_position: pygame.typing.Point | None = None  # for drawing
     is_moving: bool = False
-    _sprites: dict[Direction, dict[MovementType, pygame.surface.Surface]]
+    _sprites: tuple[pygame.surface.Surface, ...]  # indexed by Direction
 
     def __init__(
         self: Self,
         game_state_manager: GameStateManager,
         position: pygame.typing.Point,
-        sprites: dict[Direction, dict[MovementType, pygame.surface.Surface]],
+        sprites: tuple[pygame.surface.Surface, ...],
     ) -> None:
         self.id = uuid4()
         self.game_state_manager = game_state_manager
         self.position = position
         self.direction = Direction.DOWN
         self.movement_type = MovementType.WALKING
+        self.speed = self.movement_type.speed()
         self._sprites = sprites
-        self.surface = self._sprites[self.direction][MovementType.IDLE]
+        self.surface = self._sprites[self.direction]
         self.rect = self.surface.get_frect()
         self.hitbox = pygame.rect.FRect((0, 0), TILE_SIZE)
         self.set_position(position)
@@ -764,6 +965,7 @@ class Character:
         self.position = position
         self.hitbox.topleft = (x * _TILE_SIZE, y * _TILE_SIZE)
         self.rect.midbottom = self.hitbox.midbottom
+        self.game_state_manager.redraw = True
 
     def set_next_position(self: Self, position: pygame.typing.Point) -> None:
         x, y = position
@@ -778,7 +980,7 @@ class Character:
 
     def move(self: Self, position: pygame.typing.Point) -> bool:
         if (direction := self.get_direction(position)) != self.direction:
-            self.direction = direction
+            self.set_direction(direction)
             return False
         if not self.game_state_manager.is_walkable(position, collision_type=self._character_type):
             return False
@@ -788,18 +990,22 @@ class Character:
     def get_direction(self: Self, position: pygame.typing.Point) -> Direction:
         current_x, current_y = self.position
         x, y = position
-        if y > current_y:
-            return Direction.DOWN
-        if y < current_y:
-            return Direction.UP
-        if x > current_x:
-            return Direction.RIGHT
-        if x < current_x:
-            return Direction.LEFT
-        return self.direction
+        sign_x = (x > current_x) - (x < current_x)
+        sign_y = (y > current_y) - (y < current_y)
+        direction = _SIGN_DIRECTIONS[(sign_y + 1) * 3 + sign_x + 1]
+        return self.direction if direction is None else direction
+
+    def set_movement_type(self: Self, movement_type: MovementType) -> None:
+        if movement_type != self.movement_type:
+            self.movement_type = movement_type
+            self.speed = movement_type.speed()
+
+    def set_direction(self: Self, direction: Direction) -> None:
+        self.direction = direction
+        self.surface = self._sprites[direction]
+        self.game_state_manager.redraw = True
 
     def update(self: Self, dt: float) -> bool:
-        self.surface = self._sprites[self.direction][MovementType.IDLE]
         if self.is_moving:
             return self.handle_moving(dt)
         return False
@@ -811,46 +1017,98 @@ class Character:
             self.position = self.next_position
             self.unset_next_position()
             return False
-        max_distance = self.movement_type.speed() * dt
-        current = pygame.math.Vector2(self.hitbox.topleft)
-        current.move_towards_ip(self.next_hitbox_position, max_distance)
-        self.hitbox.topleft = current
+        step = self.speed * dt
+        x, y = self.hitbox.topleft
+        target_x, target_y = self.next_hitbox_position
+        dx, dy = target_x - x, target_y - y
+        # moves are between adjacent tiles, so the manhattan distance is the euclidean one
+        distance = abs(dx) + abs(dy)
+        if distance <= step:
+            x, y = target_x, target_y
+        else:
+            ratio = step / distance
+            x, y = x + dx * ratio, y + dy * ratio
+        self.hitbox.topleft = (x, y)
         self.rect.midbottom = self.hitbox.midbottom
+        self.game_state_manager.redraw = True
         return True
 
 
 class Lancer(Character, charater_type="lancer"):
     state: LancerState
-    patrol_route: MovementGenerator[pygame.typing.Point]
+    patrol_route: tuple[pygame.typing.Point, ...]
+    _patrol_index: int = 0
+    route_marker_positions: tuple[pygame.typing.Point, ...]  # pixel position of each route marker
+    route_rect: pygame.rect.FRect  # covers every route marker
     line_of_sight_distance: int
+    _line_of_sight: list[pygame.typing.Point]
+    _line_of_sight_key: tuple[pygame.typing.Point, Direction] | None = None
 
     def __init__(
         self: Self,
         game_state_manager: GameStateManager,
         position: pygame.typing.Point,
-        route: list[pygame.typing.Point],
+        route: tuple[pygame.typing.Point, ...],
         line_of_sight_distance: int = 5,
     ) -> None:
         super().__init__(game_state_manager, position, get_character_surface(LANCER_COLOR))
         self.state = LancerState.patrolling
-        self.patrol_route = MovementGenerator(route)
+        if not route:
+            msg = "Lancer route must have at least one position"
+            raise ValueError(msg)
+        self.patrol_route = route
+        self.route_marker_positions = tuple(
+            (x * _TILE_SIZE + _MARKER_OFFSET, y * _TILE_SIZE + _MARKER_OFFSET) for x, y in route
+        )
+        first_marker_rect, *marker_rects = map(_get_marker_rect, route)
+        self.route_rect = first_marker_rect.unionall(marker_rects)
         self.line_of_sight_distance = line_of_sight_distance
+        self._line_of_sight = []  # cast on the first lookup, the key is still None
+
+    @override
+    def set_position(self: Self, position: pygame.typing.Point) -> None:
+        super().set_position(position)
+        self.game_state_manager.invalidate__lancers_occupied()
+
+    @override
+    def set_next_position(self: Self, position: pygame.typing.Point) -> None:
+        super().set_next_position(position)
+        self.game_state_manager.invalidate__lancers_occupied()
+
+    @override
+    def unset_next_position(self: Self) -> None:
+        super().unset_next_position()
+        self.game_state_manager.invalidate__lancers_occupied()
+
+    def next_patrol_position(self: Self) -> pygame.typing.Point:
+        return self.patrol_route[self._patrol_index]
+
+    def advance_patrol(self: Self) -> None:
+        self._patrol_index = (self._patrol_index + 1) % len(self.patrol_route)
+        self.game_state_manager.redraw = True  # the next route marker moved
 
     def get_line_of_sight(self: Self) -> list[pygame.typing.Point]:
+        # walls are static, the line of sight only changes when the lancer moves or turns
+        key = (self.position, self.direction)
+        if key != self._line_of_sight_key:
+            self._line_of_sight = self._cast_line_of_sight()
+            self._line_of_sight_key = key
+        return self._line_of_sight
+
+    def can_see(self: Self, position: pygame.typing.Point) -> bool:
         x, y = self.position
-        dx, dy = {
-            Direction.DOWN: (0, 1),
-            Direction.UP: (0, -1),
-            Direction.RIGHT: (1, 0),
-            Direction.LEFT: (-1, 0),
-        }[self.direction]
-        line_of_sight: list[pygame.typing.Point] = []
-        for i in range(1, self.line_of_sight_distance + 1):
-            next_position = (x + dx * i, y + dy * i)
-            if not self.game_state_manager.map_data.is_walkable(next_position):
-                break
-            line_of_sight.append(next_position)
-        return line_of_sight
+        target_x, target_y = position
+        dx, dy = _DIRECTION_OFFSETS[self.direction]
+        # tiles along the facing axis only, no need to build the line of sight
+        steps = (target_x - x) * dx + (target_y - y) * dy
+        if (target_x - x, target_y - y) != (dx * steps, dy * steps):
+            return False
+        reach = self.game_state_manager.map_data.get_reach(self.position, self.direction)
+        return 0 < steps <= min(self.line_of_sight_distance, reach)
+
+    def _cast_line_of_sight(self: Self) -> list[pygame.typing.Point]:
+        map_data = self.game_state_manager.map_data
+        return map_data.cast_ray(self.position, self.direction, self.line_of_sight_distance)
 
 
 class Player(Character, charater_type="player"):
@@ -858,73 +1116,76 @@ class Player(Character, charater_type="player"):
         super().__init__(game_state_manager, position, get_character_surface(PLAYER_COLOR))
 
 
-class MovementGenerator[T]:
-    items: list[T]
-    _counter: int = 0
+class Direction(IntEnum):
+    DOWN = 0
+    UP = 1
+    RIGHT = 2
+    LEFT = 3
+
 
-    def __init__(self: Self, items: list[T]) -> None:
-        self.items = items
+_DIRECTION_OFFSETS = ((0, 1), (0, -1), (1, 0), (-1, 0))  # indexed by Direction
+# indexed by (sign(dy) + 1) * 3 + sign(dx) + 1, vertical moves take precedence, None when not moving
+_SIGN_DIRECTIONS = (
+    *(Direction.UP,) * 3,
+    Direction.LEFT,
+    None,
+    Direction.RIGHT,
+    *(Direction.DOWN,) * 3,
+)
 
-    def __iter__(self: Self) -> Self:
-        return self
 
-    def __next__(self: Self) -> T:
-        return self.next()
+class MovementType(IntEnum):
+    WALKING = 0
+    RUNNING = 1
+    IDLE = 2
 
-    def next(self: Self) -> T:
-        try:
-            return self.items[self._counter]
-        except IndexError as exc:
-            msg = "No items"
-            raise StopIteration(msg) from exc
+    def speed(self: Self) -> float:
+        return _MOVEMENT_SPEEDS[self]
 
-    def advance(self: Self) -> None:
-        self._counter = (self._counter + 1) % len(self.items)
 
+_MOVEMENT_SPEEDS = (WALKING_SPEED, RUNNING_SPEED, 0.0)  # indexed by MovementType
 
-class Direction(StrEnum):
-    DOWN = auto()
-    UP = auto()
-    RIGHT = auto()
-    LEFT = auto()
 
+class TileType(IntEnum):  # values are the map characters bytes
+    EMPTY = ord(".")
+    WALL = ord("H")
+    WARP = ord("O")
+    LANCER1 = ord("1")
+    LANCER2 = ord("2")
+    PLAYER = ord("p")
 
-class MovementType(StrEnum):
-    WALKING = auto()
-    RUNNING = auto()
-    IDLE = auto()
 
-    def speed(self: Self) -> float:
-        if self == MovementType.WALKING:
-            return WALKING_SPEED
-        if self == MovementType.RUNNING:
-            return RUNNING_SPEED
-        return 0.0
+class GameState(IntEnum):
+    overworld = 0
+    game_event = 1
 
 
-class TileType(StrEnum):
-    EMPTY = "."
-    WALL = "H"
-    WARP = "O"
-    LANCER1 = "1"
-    LANCER2 = "2"
-    PLAYER = "p"
+class LancerState(IntEnum):
+    patrolling = 0
+    done = 1
 
 
-class GameState(StrEnum):
-    overworld = auto()
-    game_event = auto()
+def get_character_surface(color: pygame.color.Color) -> tuple[pygame.surface.Surface, ...]:
+    """Return one sprite per Direction, every movement type shares it"""
+    # Color is mutable and unhashable, characters of the same color share the sprites through its tuple
+    return _get_character_sprites(tuple(color))
 
 
-class LancerState(StrEnum):
-    patrolling = auto()
-    done = auto()
+@cache
+def _get_character_sprites(color: tuple[int, ...]) -> tuple[pygame.surface.Surface, ...]:
+    return tuple(_draw_direction_arrow(d, pygame.color.Color(color)) for d in Direction)
 
 
-def get_character_surface(
-    color: pygame.color.Color,
-) -> dict[Direction, dict[MovementType, pygame.surface.Surface]]:
-    return {d: {m: _draw_direction_arrow(d, color) for m in MovementType} for d in Direction}
+def parse_lancer_route(path: bytes) -> tuple[pygame.typing.Point, ...]:
+    """Return the route positions, ordered by the character marking each step"""
+    items = [
+        ((x, y), sequence)
+        for y, row in enumerate(path.strip().splitlines())
+        for x, sequence in enumerate(row)
+        if sequence != ord(".")
+    ]
+    items = sorted(items, key=itemgetter(1))
+    return tuple(map(itemgetter(0), items))
 
 
 def _draw_direction_arrow(direction: Direction, color: pygame.color.Color) -> pygame.surface.Surface:
@@ -939,7 +1200,7 @@ def _draw_direction_arrow(direction: Direction, color: pygame.color.Color) -> py
     elif direction == Direction.LEFT:
         pody_points = [body.topright, body.bottomright, body.midleft, body.topright]
     rect = pygame.rect.FRect((0, 0), (_TILE_SIZE, 2 * _TILE_SIZE))
-    surface = pygame.surface.Surface(rect.size)
+    surface = pygame.surface.Surface(rect.size).convert()
     surface.set_colorkey(COLORKEY)
     _ = surface.fill(COLORKEY)
     _ = pygame.draw.circle(surface, color, head.center, _TILE_SIZE // 4)
@@ -947,6 +1208,38 @@ def _draw_direction_arrow(direction: Direction, color: pygame.color.Color) -> py
     return surface
 
 
+@cache
+def _get_tile_surfaces() -> dict[int, pygame.surface.Surface]:  # keyed by map byte, like the grid
+    wall = pygame.surface.Surface(TILE_SIZE).convert()
+    _ = wall.fill(WALL_COLOR)
+    warp = pygame.surface.Surface(TILE_SIZE).convert()
+    _ = warp.fill(FLOOR_COLOR)
+    _ = pygame.draw.circle(warp, BLUE, warp.get_rect().center, _TILE_SIZE // 4)
+    return {TileType.WALL: wall, TileType.WARP: warp}
+
+
+@cache
+def _get_marker_surfaces() -> tuple[pygame.surface.Surface, pygame.surface.Surface, pygame.surface.Surface]:
+    """Return the route, next route step and line of sight markers"""
+    route = pygame.surface.Surface((_MARKER_SIZE, _MARKER_SIZE)).convert()
+    _ = route.fill(LANCER_ROUTE_COLOR)
+    route_next = pygame.surface.Surface((_MARKER_SIZE, _MARKER_SIZE)).convert()
+    _ = route_next.fill(LANCER_ROUTE_NEXT_COLOR)
+    raycast = pygame.surface.Surface((_MARKER_SIZE, _MARKER_SIZE)).convert()
+    raycast.set_colorkey(COLORKEY)
+    _ = raycast.fill(COLORKEY)
+    _ = pygame.draw.rect(raycast, LANCER_RAYCAST_COLOR, raycast.get_rect(), width=1)
+    return (route, route_next, raycast)
+
+
+def _get_marker_rect(position: pygame.typing.Point) -> pygame.rect.FRect:
+    x, y = position
+    return pygame.rect.FRect(
+        (x * _TILE_SIZE + _MARKER_OFFSET, y * _TILE_SIZE + _MARKER_OFFSET),
+        (_MARKER_SIZE, _MARKER_SIZE),
+    )
+
+
 def _draw_alert_mark(color: pygame.color.Color) -> list[pygame.surface.Surface]:
     polygon_rect = pygame.rect.FRect((0, 0), TILE_SIZE)
     points_1 = [polygon_rect.midtop, polygon_rect.midright, polygon_rect.midbottom, polygon_rect.midleft]
@@ -955,9 +1248,9 @@ def _draw_alert_mark(color: pygame.color.Color) -> list[pygame.surface.Surface]:
     polygon_rect.inflate_ip(-_TILE_SIZE * 0.5, 0)
     points_3 = [polygon_rect.midtop, polygon_rect.midright, polygon_rect.midbottom, polygon_rect.midleft]
     surface_rect = pygame.rect.FRect((0, 0), TILE_SIZE)
-    surface_1 = pygame.surface.Surface(surface_rect.size)
-    surface_2 = pygame.surface.Surface(surface_rect.size)
-    surface_3 = pygame.surface.Surface(surface_rect.size)
+    surface_1 = pygame.surface.Surface(surface_rect.size).convert()
+    surface_2 = pygame.surface.Surface(surface_rect.size).convert()
+    surface_3 = pygame.surface.Surface(surface_rect.size).convert()
     for surface, points in zip(
         [surface_1, surface_2, surface_3],
         [points_1, points_2, points_3],
@@ -970,12 +1263,14 @@ def _draw_alert_mark(color: pygame.color.Color) -> list[pygame.surface.Surface]:
 
 
 def main() -> None:
-    _ = pygame.base.init()
+    # only the subsystems the game uses, skips the audio and joystick initialization
+    pygame.display.init()
+    pygame.font.init()
     GameWindow().run()
 
 
 MAP1_NAME = "map1"
-MAP1_DATA = """
+MAP1_DATA = b"""
 HHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHH
 H.....................................................................................H
 H.HHHHH.....HHHHH......2........................................H.....H...............H
@@ -1028,7 +1323,7 @@ H...............................................................................
 H.....................................................................................H
 HHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHH
 """
-MAP1_LANCER1_PATH = """
+MAP1_LANCER1_PATH = b"""
 .......................................................................................
 .......................................................................................
 .....................cbavut............................................................
@@ -1081,7 +1376,7 @@ MAP1_LANCER1_PATH = """
 .......................................................................................
 .......................................................................................
 """
-MAP1_LANCER2_PATH = """
+MAP1_LANCER2_PATH = b"""
 .......................................................................................
 .......................................................................................
 .......................................................................................
@@ -1134,10 +1429,11 @@ MAP1_LANCER2_PATH = """
 .......................................................................................
 .......................................................................................
 """
+# raw route maps, parsed when the map is first loaded
 MAP1_LANCER_ROUTES = [MAP1_LANCER1_PATH, MAP1_LANCER2_PATH]
 
 MAP2_NAME = "map2"
-MAP2_DATA = """
+MAP2_DATA = b"""
 HHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHH
 H.....................................................................................H
 H.....................................................................................H
@@ -1190,7 +1486,12 @@ H...............................................................................
 H.....................................................................................H
 HHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHH
 """
-MAP2_LANCER_ROUTES = []
+MAP2_LANCER_ROUTES: list[bytes] = []
+
+MAPS = {
+    MAP1_NAME: (MAP1_DATA, MAP1_LANCER_ROUTES),
+    MAP2_NAME: (MAP2_DATA, MAP2_LANCER_ROUTES),
+}
 
 
 if __name__ == "__main__":